@@ -0,0 +1,80 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""
+Optional Cython build of the TcpGemini metric kernel.
+
+Compiling the per-ACK numeric core to a C extension removes CPython
+dispatch from the hottest arithmetic entirely, without requiring Numba
+at runtime.  tcp_gemini.py prefers this module when it has been built,
+falling back to the Numba-jitted (or plain Python) kernel otherwise.
+
+Build in place with:
+
+    python setup.py build_ext --inplace
+
+The function body and the scalar-slot constants below must stay in sync
+with _update_core and the _S_* layout in tcp_gemini.py.
+"""
+
+# Scalar-slot indices written by the kernel (subset of the _S_* layout)
+cdef Py_ssize_t _S_PREV_TIME = 0
+cdef Py_ssize_t _S_PREV_CWND = 1
+
+
+cpdef tuple update_core(
+    double[::1] scalars,
+    double[::1] tpt_buf,
+    long tpt_idx,
+    double[::1] rtt_buf,
+    long rtt_idx,
+    double[::1] cwnd_buf,
+    long cwnd_idx,
+    double[::1] bdp_buf,
+    long bdp_idx,
+    double sim_time_us,
+    double cwnd,
+    double segment_size,
+    double segments_acked,
+    double last_rtt_us,
+    double min_rtt_us,
+    double win_max_tpt,
+):
+    """
+    Typed port of the _step metric stage: ring-buffer writes, throughput
+    and BDP computation on unboxed C doubles.
+
+    Returns the same tuple as the Python kernel: updated write indices
+    followed by (throughput, bdp), the latter two -1.0 when no new sample
+    was produced this call.
+    """
+    cdef double throughput = -1.0
+    cdef double bdp = -1.0
+    cdef double inv_rtt_s
+    cdef Py_ssize_t length = rtt_buf.shape[0]
+
+    # RTT history (min/max/mean tracked incrementally by SlidingStats)
+    if last_rtt_us > 0:
+        rtt_buf[rtt_idx % length] = last_rtt_us
+        rtt_idx += 1
+
+    # Instantaneous throughput (bytes per second): one reciprocal plus a
+    # multiply instead of the nested divide
+    if last_rtt_us > 0 and segments_acked > 0:
+        inv_rtt_s = 1e6 / last_rtt_us
+        throughput = segments_acked * segment_size * inv_rtt_s
+        tpt_buf[tpt_idx % length] = throughput
+        tpt_idx += 1
+
+    # Congestion window evolution
+    cwnd_buf[cwnd_idx % length] = cwnd
+    cwnd_idx += 1
+
+    # Bandwidth-Delay Product: BDP = windowed max throughput * min RTT
+    if min_rtt_us > 0 and win_max_tpt > 0:
+        bdp = win_max_tpt * (min_rtt_us * 1e-6)
+        bdp_buf[bdp_idx % length] = bdp
+        bdp_idx += 1
+
+    scalars[_S_PREV_TIME] = sim_time_us
+    scalars[_S_PREV_CWND] = cwnd
+
+    return tpt_idx, rtt_idx, cwnd_idx, bdp_idx, throughput, bdp
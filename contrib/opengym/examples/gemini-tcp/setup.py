@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Build script for the optional Cython metric kernel used by tcp_gemini.py.
+
+    python setup.py build_ext --inplace
+"""
+
+from setuptools import setup
+from Cython.Build import cythonize
+
+setup(
+    name="gemini-tcp-core",
+    ext_modules=cythonize("_gemini_core.pyx"),
+)
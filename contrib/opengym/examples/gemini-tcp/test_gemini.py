@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from ns3gym import ns3env
 from tcp_gemini import TcpGemini
 
@@ -17,6 +18,12 @@ parser.add_argument(
 parser.add_argument(
     "--iterations", type=int, default=1, help="Number of iterations, Default: 1"
 )
+parser.add_argument(
+    "--envs",
+    type=int,
+    default=1,
+    help="Number of parallel ns-3 environments (consecutive ports), Default: 1",
+)
 parser.add_argument(
     "--verbose",
     action="store_true",
@@ -27,8 +34,12 @@ parser.add_argument(
 args = parser.parse_args()
 startSim = bool(args.start)
 iterationNum = int(args.iterations)
+numEnvs = int(args.envs)
 verbose = bool(args.verbose)
-print(f"startSim: {startSim}, iterationNum: {iterationNum}, verbose: {verbose}")
+print(
+    f"startSim: {startSim}, iterationNum: {iterationNum}, "
+    f"numEnvs: {numEnvs}, verbose: {verbose}"
+)
 
 port = 5555
 simTime = 20  # Seconds
@@ -38,40 +49,49 @@ seed = 12
 simArgs = {"--duration": simTime, "--transport_prot": "TcpGemini"}
 debug = True
 
-# Create Environment
-env = ns3env.Ns3Env(
-    port=port,
-    stepTime=stepTime,
-    startSim=startSim,
-    simSeed=seed,
-    simArgs=simArgs,
-    debug=debug,
-)
-env.reset()
-
-ob_space = env.observation_space
-ac_space = env.action_space
-
-print("Observation space: ", ob_space)
-print("Action space: ", ac_space)
-
-# Map to store Gemini agents for multiple flows
-gemini_agents = {}
 
+def make_env(env_idx):
+    """Create one ns-3 environment on its own port (and its own sim process)"""
+    return ns3env.Ns3Env(
+        port=port + env_idx,
+        stepTime=stepTime,
+        startSim=startSim,
+        simSeed=seed + env_idx,
+        simArgs=simArgs,
+        debug=debug,
+    )
+
+
+def run_episodes(env, env_idx, iterations):
+    """Run the agent loop for one environment.
+
+    Each env.step is a ZMQ round-trip into the paired ns-3 process and the
+    protocol is strictly request/reply, so a single environment cannot be
+    batched.  Parallelism comes from running several independent
+    simulations at once (--envs N): the ZMQ recv releases the GIL, so a
+    thread per environment overlaps the N simulations' compute and IPC.
+    """
+    obs = env.reset()
+
+    ob_space = env.observation_space
+    ac_space = env.action_space
+    print(f"[env {env_idx}] Observation space: ", ob_space)
+    print(f"[env {env_idx}] Action space: ", ac_space)
+
+    # Map to store Gemini agents for multiple flows (one map per env)
+    gemini_agents = {}
+
+    def get_agent(obs):
+        socketUuid = obs[0]
+        if socketUuid not in gemini_agents:
+            print(f"[env {env_idx}] Creating Gemini Fusion Agent for Socket {socketUuid}")
+            agent = TcpGemini()
+            gemini_agents[socketUuid] = agent
+        return gemini_agents[socketUuid]
 
-def get_agent(obs):
-    socketUuid = obs[0]
-    if socketUuid not in gemini_agents:
-        print(f"Creating Gemini Fusion Agent for Socket {socketUuid}")
-        agent = TcpGemini()
-        gemini_agents[socketUuid] = agent
-    return gemini_agents[socketUuid]
-
-
-try:
     currIt = 0
-    while currIt < iterationNum:
-        print(f"--- Iteration {currIt} Start ---")
+    while currIt < iterations:
+        print(f"[env {env_idx}] --- Iteration {currIt} Start ---")
         obs = env.reset()
         gemini_agents.clear()
 
@@ -114,8 +134,27 @@ try:
 
         currIt += 1
 
+
+# Create Environment(s)
+envs = [make_env(i) for i in range(numEnvs)]
+
+try:
+    if numEnvs == 1:
+        run_episodes(envs[0], 0, iterationNum)
+    else:
+        # One thread per environment: each blocks in its own ZMQ round-trip
+        # while the other simulations keep running
+        with ThreadPoolExecutor(max_workers=numEnvs) as executor:
+            futures = [
+                executor.submit(run_episodes, env, i, iterationNum)
+                for i, env in enumerate(envs)
+            ]
+            for future in futures:
+                future.result()
+
 except KeyboardInterrupt:
     print("Ctrl-C -> Exit")
 finally:
-    env.close()
+    for env in envs:
+        env.close()
     print("Done")